@@ -0,0 +1,164 @@
+import base64
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from io import BytesIO
+
+from PIL import Image
+
+# 여러 이미지 배치 분석
+#
+# 1. 이미지 전처리(크기 조정 + 인코딩)는 CPU 작업이므로 프로세스 풀에서 실행
+# 2. Vision 모델 요청은 I/O 작업이므로 스레드 풀에서 동시 실행 (동시 요청 수 제한)
+# 3. 모델이 허용하면 요청 하나에 여러 이미지를 묶어서 전송
+
+# Groq Vision 모델은 요청당 최대 5개 이미지 허용
+MAX_IMAGES_PER_REQUEST = 5
+
+# 전처리 시 긴 변 최대 길이 (픽셀)
+MAX_IMAGE_SIDE = 1024
+
+# 모델별 응답 최대 토큰 수 (목록에 없는 모델은 기본값 사용)
+DEFAULT_MAX_COMPLETION_TOKENS = 8192
+MAX_COMPLETION_TOKENS = {
+    "llama-3.2-90b-vision-preview": 8192,
+    "llama-3.2-11b-vision-preview": 8192,
+    "meta-llama/llama-4-maverick-17b-128e-instruct": 8192,
+    "meta-llama/llama-4-scout-17b-16e-instruct": 8192,
+}
+
+
+def get_max_completion_tokens(model_id):
+    """모델의 응답 최대 토큰 수"""
+    return MAX_COMPLETION_TOKENS.get(model_id, DEFAULT_MAX_COMPLETION_TOKENS)
+
+
+def preprocess_image(data, max_side=MAX_IMAGE_SIDE):
+    """이미지 바이트를 크기 조정 후 base64 JPEG 문자열로 변환 (프로세스 풀에서 실행)"""
+    image = Image.open(BytesIO(data))
+    image.thumbnail((max_side, max_side))
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffered = BytesIO()
+    image.save(buffered, format="JPEG", quality=90)
+    return base64.b64encode(buffered.getvalue()).decode()
+
+
+def _preprocess_image_safe(data):
+    """preprocess_image 결과를 (base64, 오류 메시지)로 반환 (파일 하나의 오류가 배치 전체를 멈추지 않도록)"""
+    try:
+        return preprocess_image(data), ""
+    except Exception as e:
+        return None, f"이미지를 읽을 수 없습니다: {e}"
+
+
+def preprocess_images(items, max_workers=None):
+    """(이름, 바이트) 목록을 병렬 전처리하여 (이름, base64 또는 None, 오류 메시지) 목록 반환"""
+    names = [name for name, _ in items]
+    if not items:
+        return []
+    # 이미지 수보다 많은 프로세스는 띄우지 않음
+    max_workers = min(len(items), max_workers or os.cpu_count() or 1)
+    # 여러 스레드가 도는 Streamlit 서버를 fork하면 교착될 수 있으므로 spawn으로 새 프로세스 시작
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        results = list(pool.map(_preprocess_image_safe, [data for _, data in items]))
+    return [(name, encoded, error) for name, (encoded, error) in zip(names, results)]
+
+
+def build_batch_messages(system_prompt, prompt, images):
+    """이미지 여러 개를 담은 Vision 요청 메시지 구성"""
+    if len(images) > 1:
+        prompt = (
+            f"{prompt}\n\n"
+            f"There are {len(images)} images. Answer for each image separately, in order, "
+            f"starting each answer with its number in brackets: [1], [2], ..."
+        )
+    content = [{"type": "text", "text": prompt}]
+    for image_base64 in images:
+        content.append({
+            "type": "image_url",
+            "image_url": {"url": f"data:image/jpeg;base64,{image_base64}"}
+        })
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": content}
+    ]
+
+
+# 줄 맨 앞의 답변 번호: [1], **[1]**, 1., 1), **1.** 등
+ANSWER_NUMBER_PATTERN = re.compile(
+    r"^[ \t]*(?:\*\*)?[ \t]*(?:\[(\d+)\]|(\d+)[.)])[ \t]*(?:\*\*)?[ \t]*:?",
+    re.MULTILINE,
+)
+
+
+def split_batch_response(response, count):
+    """번호로 구분된 응답을 이미지별로 분리 (번호가 정확히 1..count 순서가 아니면 None)"""
+    if count == 1:
+        return [response]
+    matches = list(ANSWER_NUMBER_PATTERN.finditer(response))
+    numbers = [int(m.group(1) or m.group(2)) for m in matches]
+    # 답변 안의 번호 목록 등으로 순서가 어긋나면 잘못 나누지 않도록 분리 실패로 처리
+    if numbers != list(range(1, count + 1)):
+        return None
+    ends = [m.start() for m in matches[1:]] + [len(response)]
+    return [response[m.end():end].strip() for m, end in zip(matches, ends)]
+
+
+def analyze_images(client, model_id, system_prompt, prompt, images,
+                   concurrency=4, images_per_request=1, temperature=0.7, max_tokens=1024):
+    """이미지들을 동시에 분석하고 완료되는 순서대로 결과 dict를 yield
+
+    images: (이름, base64) 목록
+    """
+    images_per_request = max(1, min(images_per_request, MAX_IMAGES_PER_REQUEST))
+    chunks = [images[i:i + images_per_request] for i in range(0, len(images), images_per_request)]
+
+    def request(chunk):
+        messages = build_batch_messages(system_prompt, prompt, [data for _, data in chunk])
+        chat_completion = client.chat.completions.create(
+            messages=messages,
+            model=model_id,
+            temperature=temperature,
+            # 이미지 여러 개를 묶으면 응답도 그만큼 길어짐 (모델 한도는 넘지 않도록)
+            max_tokens=min(max_tokens * len(chunk), get_max_completion_tokens(model_id)),
+        )
+        return split_batch_response(chat_completion.choices[0].message.content, len(chunk))
+
+    def run(chunk):
+        rows = []
+        answers = None
+        if len(chunk) > 1:
+            try:
+                answers = request(chunk)
+            except Exception:
+                # 묶음 요청 자체가 실패해도(요청 크기, 속도 제한 등) 아래에서 이미지별로 다시 요청
+                pass
+        if answers is not None:
+            for (name, _), answer in zip(chunk, answers):
+                rows.append({"image": name, "result": answer, "error": ""})
+            return rows
+        # 묶음 응답을 나눌 수 없으면 이미지마다 따로 다시 요청
+        for item in chunk:
+            try:
+                rows.append({"image": item[0], "result": request([item])[0], "error": ""})
+            except Exception as e:
+                rows.append({"image": item[0], "result": "", "error": str(e)})
+        return rows
+
+    # with 블록을 쓰지 않음: Streamlit이 중간에 소비를 멈추면(중지, 위젯 변경) 제너레이터가 닫히는데,
+    # 이때 남은 작업을 기다리지 않고 대기 중인 요청은 취소해야 API를 더 호출하지 않음
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        futures = {pool.submit(run, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                rows = future.result()
+            except Exception as e:
+                rows = [{"image": name, "result": "", "error": str(e)} for name, _ in chunk]
+            yield from rows
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,29 @@
+import os
+import random
+import sys
+
+import pytest
+
+# 저장소 루트의 모듈(chat_utils, model_catalog)을 import할 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 합성 모델 ID 생성에 사용할 이름 조각
+MODEL_FAMILIES = [
+    "llama-3.3-70b-versatile", "llama-3.1-8b-instant", "llama-3.2-90b-vision-preview",
+    "meta-llama/llama-4-maverick-17b-128e-instruct", "meta-llama/llama-4-scout-17b-16e-instruct",
+    "moonshotai/kimi-k2-instruct", "groq/compound", "groq/compound-mini",
+    "openai/gpt-oss-120b", "openai/gpt-oss-20b", "qwen/qwen3-32b", "allam-2-7b",
+    "gemma2-9b-it", "mixtral-8x7b-32768", "playai-tts", "whisper-large-v3",
+    "meta-llama/llama-guard-4-12b", "openai/gpt-oss-safeguard-20b", "some-vendor/new-model",
+]
+
+
+@pytest.fixture(scope="session")
+def synthetic_models_response():
+    """/models 응답 형식의 대형 합성 모델 목록 (2000개)"""
+    rng = random.Random(0)
+    data = []
+    for i in range(2000):
+        family = rng.choice(MODEL_FAMILIES)
+        data.append({"id": f"{family}-{i}", "object": "model"})
+    return {"object": "list", "data": data}
@@ -0,0 +1,125 @@
+"""상호작용별 서버 CPU 측정 (fragment 적용 전후 비교용)
+
+AppTest로 chat_app.py를 실행하면서 스크립트 스레드의 CPU 시간(time.thread_time)을 잽니다.
+AppTest는 위젯을 바꿀 때마다 스크립트 전체를 다시 실행하므로,
+- "전체 실행"은 fragment가 없을 때 상호작용마다 드는 비용이고
+- 각 fragment 함수 안에서 잰 시간은 fragment만 다시 실행될 때 드는 비용입니다.
+
+사용법:
+    python benchmarks/measure_reruns.py                     # 현재 chat_app.py
+    git show <커밋>:chat_app.py > /tmp/before.py
+    python benchmarks/measure_reruns.py /tmp/before.py      # 이전 버전과 비교
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+from types import SimpleNamespace
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 스크립트 시작 부분에 넣는 측정 코드
+PRELUDE = '''import sys as _sys
+_sys.path.insert(0, {repo_root!r})
+import time as _time
+import functools as _functools
+import streamlit as st
+_SCRIPT_START = _time.thread_time()
+
+def _record(name, start):
+    st.session_state.setdefault("_cpu_samples", {{}}).setdefault(name, []).append(
+        (_time.thread_time() - start) * 1000)
+
+def _timed_fragment(func):
+    @_functools.wraps(func)
+    def wrapped(*args, **kwargs):
+        start = _time.thread_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(func.__name__, start)
+    return st.fragment(wrapped)
+'''
+
+# 스크립트 끝에 넣는 측정 코드
+EPILOGUE = '''
+_record("full_run", _SCRIPT_START)
+'''
+
+
+def instrument(path):
+    """측정 코드를 넣은 chat_app 복사본 경로 반환"""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    source = source.replace("@st.fragment\n", "@_timed_fragment\n")
+    instrumented = PRELUDE.format(repo_root=REPO_ROOT) + source + EPILOGUE
+    handle, instrumented_path = tempfile.mkstemp(suffix="_chat_app.py")
+    with os.fdopen(handle, "w", encoding="utf-8") as f:
+        f.write(instrumented)
+    return instrumented_path
+
+
+def fake_completion(self, **kwargs):
+    """API 호출 대신 고정된 응답 반환"""
+    message = SimpleNamespace(content="답변입니다. " * 50)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_history(count):
+    messages = []
+    for i in range(count // 2):
+        messages.append({"role": "user", "content": f"질문 {i} " * 20})
+        messages.append({"role": "assistant", "model_name": "Llama 3.3 70B",
+                         "content": "답변입니다. " * 100, "has_cjk": False})
+    return messages
+
+
+def summarize(samples, skip):
+    """처음 skip개(캐시 준비)를 제외한 중앙값"""
+    return {name: statistics.median(values[skip:]) for name, values in samples.items() if values[skip:]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("app", nargs="?", default=os.path.join(REPO_ROOT, "chat_app.py"))
+    parser.add_argument("--messages", type=int, default=100, help="미리 채워 둘 대화 기록 수")
+    parser.add_argument("--repeat", type=int, default=20, help="상호작용 반복 횟수")
+    args = parser.parse_args()
+
+    import groq.resources.chat.completions as completions
+    from streamlit.testing.v1 import AppTest
+
+    completions.Completions.create = fake_completion
+    path = instrument(args.app)
+    try:
+        # 설정 변경: Temperature 슬라이더
+        app = AppTest.from_file(path, default_timeout=60)
+        app.session_state["messages"] = make_history(args.messages)
+        app.run()
+        app.session_state["_cpu_samples"] = {}
+        for i in range(args.repeat):
+            app.sidebar.slider[0].set_value(round(0.1 * (i % 10), 1)).run()
+        slider = summarize(app.session_state["_cpu_samples"], skip=2)
+
+        # 새 메시지 전송 (대화 기록은 매번 같은 길이로 유지)
+        app = AppTest.from_file(path, default_timeout=60)
+        history = make_history(args.messages)
+        app.session_state["messages"] = list(history)
+        app.run()
+        app.session_state["_cpu_samples"] = {}
+        for i in range(args.repeat):
+            app.session_state["messages"] = list(history)
+            app.chat_input[0].set_value(f"질문 {i}").run()
+        chat = summarize(app.session_state["_cpu_samples"], skip=2)
+    finally:
+        os.remove(path)
+
+    print(f"{args.app} (대화 기록 {args.messages}개, 스크립트 스레드 CPU 중앙값)")
+    for label, result in (("설정 변경", slider), ("메시지 전송", chat)):
+        parts = [f"{name} {value:.1f} ms" for name, value in sorted(result.items())]
+        print(f"  {label}: " + ", ".join(parts))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
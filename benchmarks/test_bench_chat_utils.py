@@ -0,0 +1,51 @@
+import pytest
+from PIL import Image
+
+from chat_utils import build_chat_messages, build_system_prompt, clean_cjk, encode_image
+
+SHORT_TEXT = "안녕하세요! Groq Playground 입니다."
+LONG_TEXT = ("Groq는 빠른 추론을 제공합니다. The quick brown fox jumps over the lazy dog. " * 400)
+CJK_HEAVY_TEXT = ("这是一个测试。日本語の文章です。한국어 문장입니다. " * 400)
+
+
+@pytest.mark.parametrize("text", [SHORT_TEXT, LONG_TEXT], ids=["short", "long"])
+def test_clean_cjk_without_cjk(benchmark, text):
+    cleaned, found = benchmark(clean_cjk, text)
+    assert cleaned == text
+    assert found == []
+
+
+def test_clean_cjk_cjk_heavy(benchmark):
+    cleaned, found = benchmark(clean_cjk, CJK_HEAVY_TEXT)
+    assert "这" in found
+    assert "这" not in cleaned
+    assert "한국어" in cleaned
+
+
+@pytest.mark.parametrize("size", [64, 512, 1024])
+def test_encode_image(benchmark, size):
+    image = Image.new("RGB", (size, size), (120, 40, 200))
+    encoded = benchmark(encode_image, image)
+    assert encoded.startswith("iVBOR")  # PNG 시그니처
+
+
+def test_build_text_messages(benchmark):
+    def build():
+        return build_chat_messages(build_system_prompt("Llama 3.3 70B"), SHORT_TEXT)
+
+    messages = benchmark(build)
+    assert [m["role"] for m in messages] == ["system", "user"]
+    assert messages[1]["content"] == SHORT_TEXT
+
+
+def test_build_vision_messages(benchmark):
+    image = Image.new("RGB", (512, 512), (10, 200, 30))
+
+    def build():
+        return build_chat_messages(
+            build_system_prompt("Llama 3.2 90B Vision"), SHORT_TEXT, image_base64=encode_image(image)
+        )
+
+    messages = benchmark(build)
+    assert messages[1]["content"][1]["image_url"]["url"].startswith("data:image/png;base64,")
+
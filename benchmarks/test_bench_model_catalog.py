@@ -0,0 +1,32 @@
+from model_catalog import (
+    DEFAULT_MODELS, build_model_catalog, get_display_name, get_model_description, get_model_icon
+)
+
+
+def test_build_model_catalog(benchmark, synthetic_models_response):
+    catalog = benchmark(build_model_catalog, synthetic_models_response)
+    assert set(DEFAULT_MODELS) <= set(catalog)
+    assert not any("whisper" in model_id or "guard" in model_id for model_id in catalog.values())
+
+
+def test_get_display_name(benchmark, synthetic_models_response):
+    model_ids = [model["id"] for model in synthetic_models_response["data"]]
+
+    names = benchmark(lambda: [get_display_name(model_id) for model_id in model_ids])
+    assert "Llama 3.3 70B" in names
+    assert "Groq Compound Mini" in names
+
+
+def test_get_model_icon(benchmark, synthetic_models_response):
+    names = list(build_model_catalog(synthetic_models_response))
+
+    icons = benchmark(lambda: {name: get_model_icon(name) for name in names})
+    assert icons["Llama 3.2 90B Vision"] == "👁️"
+    assert icons["Llama 3.3 70B"] == "🦙"
+
+
+def test_get_model_description(benchmark, synthetic_models_response):
+    names = list(build_model_catalog(synthetic_models_response))
+
+    descriptions = benchmark(lambda: {name: get_model_description(name) for name in names})
+    assert all(descriptions[name]["description"] for name in names)
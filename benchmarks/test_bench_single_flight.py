@@ -0,0 +1,20 @@
+from chat_utils import build_chat_messages, build_system_prompt
+from single_flight import SingleFlight, request_key
+
+
+def test_request_key(benchmark):
+    messages = build_chat_messages(build_system_prompt("Llama 3.3 70B"), "안녕하세요! " * 200)
+
+    key = benchmark(request_key, messages=messages, model="llama-3.3-70b-versatile",
+                    temperature=0.7, max_tokens=1024)
+    assert key == request_key(max_tokens=1024, temperature=0.7,
+                              model="llama-3.3-70b-versatile", messages=messages)
+
+
+def test_do_uncontended(benchmark):
+    single_flight = SingleFlight()
+
+    result = benchmark(single_flight.do, "key", lambda: "response")
+    assert result == ("response", False)
+    assert single_flight.coalesced == 0
+
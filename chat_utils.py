@@ -0,0 +1,88 @@
+import base64
+import hashlib
+import re
+from io import BytesIO
+
+# 채팅 메시지 및 텍스트 처리
+#
+# Streamlit 없이 사용할 수 있는 순수 함수 모음 (벤치마크에서 직접 import)
+
+# 중국어/일본어 한자 (CJK 통합 한자 + 확장 A)
+CJK_PATTERN = re.compile(r'[\u4E00-\u9FFF\u3400-\u4DBF]')
+
+# 중국어/일본어 한자 감지 및 제거
+def clean_cjk(text):
+    """한자를 '?'로 바꾼 텍스트와 발견된 한자 목록(중복 제거) 반환"""
+    found_cjk = CJK_PATTERN.findall(text)
+
+    if found_cjk:
+        return CJK_PATTERN.sub('?', text), list(set(found_cjk))
+
+    return text, []
+
+# 이미지를 base64로 인코딩
+def encode_image(image):
+    """PIL Image를 base64 문자열로 변환"""
+    buffered = BytesIO()
+    image.save(buffered, format="PNG")
+    return base64.b64encode(buffered.getvalue()).decode()
+
+# 시스템 프롬프트 템플릿
+SYSTEM_PROMPT_TEMPLATE = """You are {model_name} model.
+
+CRITICAL RULES:
+- ONLY use Korean (한국어) OR English
+- NEVER use Chinese (汉字), Japanese (日本語), or other languages
+- For Korean: Use ONLY Hangul (한글), NO Hanja (한자)
+- Match the user's language (Korean question → Korean answer)"""
+
+# 시스템 프롬프트 생성
+def build_system_prompt(model_name):
+    """모델 이름으로 시스템 프롬프트 생성"""
+    return SYSTEM_PROMPT_TEMPLATE.format(model_name=model_name)
+
+# 이미지 바이트 다이제스트
+def image_digest(data):
+    """이미지 바이트의 SHA-256 다이제스트 (대화 내 이미지 인코딩 재사용 키)"""
+    return hashlib.sha256(data).hexdigest()
+
+# 응답 usage에서 프롬프트 관련 통계 추출
+def extract_prompt_usage(usage):
+    """(프롬프트 토큰, 캐시된 프롬프트 토큰, 첫 토큰까지 서버 시간(초)) 반환"""
+    if usage is None:
+        return 0, 0, 0.0
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+    # 비스트리밍 요청이므로 대기 시간 + 프롬프트 처리 시간을 첫 토큰까지 시간으로 사용
+    time_to_first_token = (getattr(usage, "queue_time", 0.0) or 0.0) + (getattr(usage, "prompt_time", 0.0) or 0.0)
+    return usage.prompt_tokens or 0, cached_tokens, time_to_first_token
+
+# 채팅 요청 메시지 구성
+def build_chat_messages(system_prompt, prompt, image_base64=None, image_ignored=False):
+    """시스템 프롬프트, 사용자 입력, (선택) 이미지로 요청 메시지 목록 구성"""
+    if image_base64:
+        # Vision 모델용 메시지 구성
+        return [
+            {"role": "system", "content": system_prompt},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/png;base64,{image_base64}"
+                        }
+                    }
+                ]
+            }
+        ]
+
+    if image_ignored:
+        # Vision 모델이 아닌데 이미지가 업로드된 경우
+        prompt = prompt + " (참고: 이미지가 업로드되었지만 현재 모델은 이미지를 처리할 수 없습니다)"
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt}
+    ]
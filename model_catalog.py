@@ -0,0 +1,295 @@
+# 모델 목록 및 모델 정보
+#
+# Streamlit이나 네트워크 없이 사용할 수 있는 순수 함수 모음 (벤치마크에서 직접 import)
+
+# 기본 모델 목록 (항상 표시)
+DEFAULT_MODELS = {
+    "Llama 3.3 70B": "llama-3.3-70b-versatile",
+    "Llama 3.1 70B": "llama-3.1-70b-versatile",
+    "Llama 3.1 8B": "llama-3.1-8b-instant",
+    "Mixtral 8x7B": "mixtral-8x7b-32768",
+    "Llama 3.2 90B Vision": "llama-3.2-90b-vision-preview",
+    "Llama 3.2 11B Vision": "llama-3.2-11b-vision-preview",
+}
+
+# TTS, Whisper, Guard 모델 제외 (채팅 API 미지원)
+SKIP_KEYWORDS = ["tts", "whisper", "guard", "safeguard"]
+
+# 모델 ID로 사용자 친화적인 이름 생성
+def get_display_name(model_id):
+    """모델 ID를 표시 이름으로 변환"""
+    if "llama-3.3-70b" in model_id:
+        return "Llama 3.3 70B"
+    elif "llama-3.1-70b" in model_id:
+        return "Llama 3.1 70B"
+    elif "llama-3.1-8b" in model_id:
+        return "Llama 3.1 8B"
+    elif "mixtral-8x7b" in model_id:
+        return "Mixtral 8x7B"
+    elif "llama-3.2-90b-vision" in model_id:
+        return "Llama 3.2 90B Vision"
+    elif "llama-3.2-11b-vision" in model_id:
+        return "Llama 3.2 11B Vision"
+    elif "llama-4-maverick" in model_id:
+        return "Llama 4 Maverick 17B"
+    elif "llama-4-scout" in model_id:
+        return "Llama 4 Scout 17B"
+    elif "kimi-k2" in model_id:
+        return "Kimi K2"
+    elif "compound-mini" in model_id:
+        return "Groq Compound Mini"
+    elif "compound" in model_id and "mini" not in model_id:
+        return "Groq Compound"
+    elif "gpt-oss-120b" in model_id:
+        return "GPT-OSS 120B"
+    elif "gpt-oss-20b" in model_id:
+        return "GPT-OSS 20B"
+    elif "qwen3-32b" in model_id:
+        return "Qwen 3 32B"
+    elif "allam-2-7b" in model_id:
+        return "Allam 2 7B"
+    else:
+        # 기본 이름 생성
+        return model_id.replace("/", " - ").replace("-", " ").title()
+
+# API 응답으로 모델 목록 구성
+def build_model_catalog(models_data):
+    """/models 응답 JSON을 {표시 이름: 모델 ID}로 변환 (기본 모델과 병합)"""
+    api_models = {}
+
+    for model in models_data.get("data", []):
+        model_id = model.get("id", "")
+
+        lowered = model_id.lower()
+        if any(keyword in lowered for keyword in SKIP_KEYWORDS):
+            continue
+
+        api_models[get_display_name(model_id)] = model_id
+
+    # 기본 모델과 API 모델 병합 (API 모델이 우선)
+    return {**DEFAULT_MODELS, **api_models}
+
+# 모델별 아이콘 (동적으로 생성)
+def get_model_icon(model_name):
+    """모델 이름에 따라 아이콘 반환"""
+    if "Tts" in model_name or "TTS" in model_name:
+        return "🔊"
+    elif "Vision" in model_name:
+        return "👁️"
+    elif "Llama 4" in model_name:
+        return "🦙✨"
+    elif "Llama" in model_name:
+        return "🦙"
+    elif "Mixtral" in model_name:
+        return "🌀"
+    elif "Gemma" in model_name:
+        return "💎"
+    elif "Qwen" in model_name:
+        return "🐉"
+    elif "Kimi" in model_name:
+        return "🌙"
+    elif "Compound" in model_name:
+        return "⚡"
+    elif "GPT-OSS" in model_name:
+        return "🔓"
+    elif "Allam" in model_name:
+        return "🌍"
+    else:
+        return "🤖"
+
+# TTS 모델인지 확인하는 함수
+def is_tts_model(model_name):
+    """모델이 TTS 모델인지 확인"""
+    return "tts" in model_name.lower()
+
+# 모델별 설명 (기본 정보)
+DEFAULT_MODEL_DESCRIPTIONS = {
+    "Llama 3.3 70B": {
+        "description": "Meta의 최신 대형 언어 모델",
+        "strengths": "고품질 응답, 복잡한 추론, 창의적 작업",
+        "best_for": "전문적인 질문, 긴 대화, 복잡한 문제 해결",
+        "speed": "보통",
+        "quality": "⭐⭐⭐⭐⭐"
+    },
+    "Llama 3.1 70B": {
+        "description": "안정적이고 강력한 대형 모델",
+        "strengths": "균형잡힌 성능, 신뢰성 높은 응답",
+        "best_for": "일반적인 질문, 분석, 요약",
+        "speed": "보통",
+        "quality": "⭐⭐⭐⭐⭐"
+    },
+    "Llama 3.1 8B": {
+        "description": "빠르고 효율적인 소형 모델",
+        "strengths": "빠른 응답 속도, 낮은 지연시간",
+        "best_for": "간단한 질문, 빠른 대화, 실시간 응답",
+        "speed": "매우 빠름 ⚡",
+        "quality": "⭐⭐⭐⭐"
+    },
+    "Mixtral 8x7B": {
+        "description": "Mistral AI의 고성능 MoE 모델",
+        "strengths": "다양한 작업 처리, 멀티태스킹",
+        "best_for": "코딩, 기술 문서, 다국어 지원",
+        "speed": "빠름",
+        "quality": "⭐⭐⭐⭐⭐"
+    },
+    "Llama 3.2 90B Vision": {
+        "description": "비전 기능이 있는 대형 멀티모달 모델",
+        "strengths": "이미지 이해, 시각적 추론",
+        "best_for": "이미지 분석, 시각적 질문 답변",
+        "speed": "보통",
+        "quality": "⭐⭐⭐⭐⭐"
+    },
+    "Llama 3.2 11B Vision": {
+        "description": "빠른 비전 처리가 가능한 모델",
+        "strengths": "빠른 이미지 처리, 효율적인 비전 작업",
+        "best_for": "빠른 이미지 분석, 실시간 비전 작업",
+        "speed": "빠름",
+        "quality": "⭐⭐⭐⭐"
+    }
+}
+
+def get_model_description(model_name):
+    """모델 이름에 따라 설명 생성"""
+    # 기본 설명이 있으면 반환
+    if model_name in DEFAULT_MODEL_DESCRIPTIONS:
+        return DEFAULT_MODEL_DESCRIPTIONS[model_name]
+
+    # 동적으로 설명 생성
+    model_lower = model_name.lower()
+
+    # TTS 모델
+    if "tts" in model_lower:
+        return {
+            "description": "텍스트를 음성으로 변환하는 TTS 모델",
+            "strengths": "자연스러운 음성 생성, 다양한 목소리",
+            "best_for": "텍스트 음성 변환, 오디오 생성",
+            "speed": "빠름",
+            "quality": "⭐⭐⭐⭐"
+        }
+
+    # Vision 모델
+    elif "vision" in model_lower:
+        return {
+            "description": "멀티모달 비전 모델",
+            "strengths": "이미지 이해, 시각적 분석",
+            "best_for": "이미지 분석, 시각적 질문 답변",
+            "speed": "보통",
+            "quality": "⭐⭐⭐⭐"
+        }
+
+    # Llama 4 모델
+    elif "llama 4" in model_lower or "llama-4" in model_lower:
+        if "maverick" in model_lower:
+            return {
+                "description": "Meta의 Llama 4 Maverick 모델",
+                "strengths": "최신 아키텍처, 향상된 추론 능력",
+                "best_for": "복잡한 문제 해결, 전문적인 대화",
+                "speed": "빠름",
+                "quality": "⭐⭐⭐⭐⭐"
+            }
+        elif "scout" in model_lower:
+            return {
+                "description": "Meta의 Llama 4 Scout 모델",
+                "strengths": "빠른 탐색, 효율적인 처리",
+                "best_for": "빠른 질문 답변, 일반 대화",
+                "speed": "매우 빠름 ⚡",
+                "quality": "⭐⭐⭐⭐"
+            }
+    # Llama 모델
+    elif "llama" in model_lower:
+        if "70b" in model_lower or "90b" in model_lower:
+            return {
+                "description": "Meta의 대형 언어 모델",
+                "strengths": "고품질 응답, 복잡한 추론",
+                "best_for": "전문적인 질문, 복잡한 작업",
+                "speed": "보통",
+                "quality": "⭐⭐⭐⭐⭐"
+            }
+        else:
+            return {
+                "description": "Meta의 효율적인 언어 모델",
+                "strengths": "빠른 응답, 효율적인 처리",
+                "best_for": "일반적인 질문, 빠른 대화",
+                "speed": "빠름",
+                "quality": "⭐⭐⭐⭐"
+            }
+
+    # Mixtral 모델
+    elif "mixtral" in model_lower:
+        return {
+            "description": "Mistral AI의 MoE 모델",
+            "strengths": "다양한 작업, 코딩 지원",
+            "best_for": "코딩, 기술 문서, 복잡한 작업",
+            "speed": "빠름",
+            "quality": "⭐⭐⭐⭐⭐"
+        }
+
+    # Gemma 모델
+    elif "gemma" in model_lower:
+        return {
+            "description": "Google의 경량 언어 모델",
+            "strengths": "효율적인 처리, 빠른 응답",
+            "best_for": "일반 대화, 빠른 작업",
+            "speed": "매우 빠름 ⚡",
+            "quality": "⭐⭐⭐⭐"
+        }
+
+    # Qwen 모델
+    elif "qwen" in model_lower:
+        return {
+            "description": "Alibaba의 다국어 언어 모델",
+            "strengths": "다국어 지원, 다양한 작업",
+            "best_for": "다국어 처리, 일반 작업",
+            "speed": "보통",
+            "quality": "⭐⭐⭐⭐"
+        }
+
+    # Kimi 모델
+    elif "kimi" in model_lower:
+        return {
+            "description": "Moonshot AI의 장문맥 언어 모델",
+            "strengths": "긴 문맥 이해, 복잡한 대화",
+            "best_for": "긴 문서 분석, 복잡한 추론",
+            "speed": "보통",
+            "quality": "⭐⭐⭐⭐⭐"
+        }
+
+    # Groq Compound 모델
+    elif "compound" in model_lower:
+        return {
+            "description": "Groq의 최적화된 언어 모델",
+            "strengths": "초고속 추론, 효율적인 처리",
+            "best_for": "빠른 응답, 실시간 대화",
+            "speed": "초고속 ⚡⚡",
+            "quality": "⭐⭐⭐⭐⭐"
+        }
+
+    # GPT-OSS 모델
+    elif "gpt-oss" in model_lower:
+        return {
+            "description": "오픈소스 GPT 스타일 모델",
+            "strengths": "강력한 언어 이해, 범용 작업",
+            "best_for": "일반 대화, 다양한 작업",
+            "speed": "보통",
+            "quality": "⭐⭐⭐⭐⭐"
+        }
+
+    # Allam 모델
+    elif "allam" in model_lower:
+        return {
+            "description": "IBM의 다국어 언어 모델",
+            "strengths": "아랍어 지원, 다국어 처리",
+            "best_for": "다국어 작업, 문화적 이해",
+            "speed": "빠름",
+            "quality": "⭐⭐⭐⭐"
+        }
+
+    # 기타 모델
+    else:
+        return {
+            "description": "언어 모델",
+            "strengths": "다양한 작업 처리",
+            "best_for": "일반적인 질문, 대화",
+            "speed": "보통",
+            "quality": "⭐⭐⭐"
+        }
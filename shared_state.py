@@ -0,0 +1,259 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# 공유 상태 백엔드
+#
+# 여러 Streamlit 프로세스(워커)가 모델 상태, 모델 목록, 속도 제한 카운터를
+# 함께 보도록 하기 위한 저장소입니다. 모든 값은 JSON으로 직렬화되며 TTL(초)을 가질 수 있습니다.
+#
+# 환경 변수로 백엔드 선택:
+#   GROQ_STATE_BACKEND = memory (기본) | sqlite | redis
+#   GROQ_STATE_PATH    = SQLite 파일 경로 (기본: .groq_state.sqlite3)
+#   GROQ_STATE_URL     = Redis URL (기본: redis://localhost:6379/0)
+
+
+class StateBackend:
+    """공유 상태 백엔드 기본 인터페이스"""
+
+    def get(self, key, default=None):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def incr(self, key, amount=1, ttl=None):
+        """카운터 증가 (TTL은 카운터가 새로 만들어질 때만 적용)"""
+        raise NotImplementedError
+
+    def add_member(self, key, member, ttl=None):
+        """집합에 멤버 추가 (멤버별 TTL)"""
+        raise NotImplementedError
+
+    def remove_member(self, key, member):
+        raise NotImplementedError
+
+    def members(self, key):
+        """만료되지 않은 멤버 집합 반환"""
+        raise NotImplementedError
+
+
+def _expires_at(ttl):
+    return time.time() + ttl if ttl else None
+
+
+def _is_alive(expires_at, now):
+    return expires_at is None or expires_at > now
+
+
+class InProcessBackend(StateBackend):
+    """프로세스 내부 메모리 백엔드 (기본값, 워커 간 공유 없음)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._sets = {}
+
+    def get(self, key, default=None):
+        entry = self._values.get(key)
+        if entry is None or not _is_alive(entry[1], time.time()):
+            return default
+        return entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._values[key] = (value, _expires_at(ttl))
+
+    def delete(self, key):
+        with self._lock:
+            self._values.pop(key, None)
+            self._sets.pop(key, None)
+
+    def incr(self, key, amount=1, ttl=None):
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None or not _is_alive(entry[1], time.time()):
+                entry = (0, _expires_at(ttl))
+            value = entry[0] + amount
+            self._values[key] = (value, entry[1])
+            return value
+
+    def add_member(self, key, member, ttl=None):
+        with self._lock:
+            self._sets.setdefault(key, {})[member] = _expires_at(ttl)
+
+    def remove_member(self, key, member):
+        with self._lock:
+            self._sets.get(key, {}).pop(member, None)
+
+    def members(self, key):
+        now = time.time()
+        return {m for m, exp in list(self._sets.get(key, {}).items()) if _is_alive(exp, now)}
+
+
+class SQLiteBackend(StateBackend):
+    """로컬 SQLite 파일 백엔드 (같은 머신의 여러 워커가 공유)"""
+
+    def __init__(self, path=".groq_state.sqlite3"):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS members ("
+                "key TEXT NOT NULL, member TEXT NOT NULL, expires_at REAL, "
+                "PRIMARY KEY (key, member))"
+            )
+
+    def _conn(self):
+        # 스레드마다 연결 하나 (Streamlit은 세션마다 다른 스레드에서 스크립트 실행)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        # 자동 커밋 모드이므로 직접 트랜잭션 시작 (IMMEDIATE: 워커 간 쓰기 직렬화)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get(self, key, default=None):
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM kv WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or not _is_alive(row[1], time.time()):
+            return default
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), _expires_at(ttl)),
+        )
+
+    def delete(self, key):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+            conn.execute("DELETE FROM members WHERE key = ?", (key,))
+
+    def incr(self, key, amount=1, ttl=None):
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM kv WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or not _is_alive(row[1], time.time()):
+                value, expires_at = amount, _expires_at(ttl)
+            else:
+                value, expires_at = json.loads(row[0]) + amount, row[1]
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+        return value
+
+    def add_member(self, key, member, ttl=None):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO members (key, member, expires_at) VALUES (?, ?, ?)",
+            (key, member, _expires_at(ttl)),
+        )
+
+    def remove_member(self, key, member):
+        self._conn().execute(
+            "DELETE FROM members WHERE key = ? AND member = ?", (key, member)
+        )
+
+    def members(self, key):
+        rows = self._conn().execute(
+            "SELECT member FROM members WHERE key = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchall()
+        return {row[0] for row in rows}
+
+
+class RedisBackend(StateBackend):
+    """Redis 프로토콜 백엔드 (여러 머신의 워커가 공유)
+
+    client를 직접 넘기면 redis-py와 같은 인터페이스를 가진 대체 구현(fakeredis 등)을 사용할 수 있습니다.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", client=None, prefix="groq:"):
+        if client is None:
+            import redis  # 선택 의존성
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key):
+        return self.prefix + key
+
+    @staticmethod
+    def _ttl_ms(ttl):
+        # 1초 미만 TTL도 유지되도록 밀리초 단위 사용 (Redis는 만료 시간 0을 거부)
+        return max(1, int(ttl * 1000))
+
+    def get(self, key, default=None):
+        raw = self.client.get(self._key(key))
+        return default if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self._key(key), json.dumps(value), px=self._ttl_ms(ttl) if ttl else None)
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+    def incr(self, key, amount=1, ttl=None):
+        name = self._key(key)
+        if not ttl:
+            return self.client.incrby(name, amount)
+        # 증가와 만료 설정을 MULTI로 묶어 중간에 워커가 죽어도 만료 없는 카운터가 남지 않도록
+        # (NX: 이미 만료 시간이 있는 카운터는 연장하지 않음)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.incrby(name, amount)
+        pipe.pexpire(name, self._ttl_ms(ttl), nx=True)
+        value, _ = pipe.execute()
+        return value
+
+    def add_member(self, key, member, ttl=None):
+        # 정렬 집합의 점수를 만료 시각으로 사용 (만료 없음은 +inf)
+        score = _expires_at(ttl) or float("inf")
+        self.client.zadd(self._key(key), {member: score})
+
+    def remove_member(self, key, member):
+        self.client.zrem(self._key(key), member)
+
+    def members(self, key):
+        raw = self.client.zrangebyscore(self._key(key), time.time(), "+inf")
+        return {m.decode() if isinstance(m, bytes) else m for m in raw}
+
+
+def create_backend(kind=None, path=None, url=None):
+    """환경 변수 또는 인자에 따라 백엔드 생성"""
+    kind = (kind or os.environ.get("GROQ_STATE_BACKEND", "memory")).lower()
+    if kind == "sqlite":
+        return SQLiteBackend(path or os.environ.get("GROQ_STATE_PATH", ".groq_state.sqlite3"))
+    if kind == "redis":
+        return RedisBackend(url or os.environ.get("GROQ_STATE_URL", "redis://localhost:6379/0"))
+    if kind == "memory":
+        return InProcessBackend()
+    raise ValueError(f"알 수 없는 상태 백엔드: {kind}")
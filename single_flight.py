@@ -0,0 +1,149 @@
+import hashlib
+import json
+import threading
+
+# 동일 요청 병합 (single-flight)
+#
+# 같은 키의 요청이 이미 진행 중이면 새로 API를 호출하지 않고 진행 중인 호출의 결과(또는 스트림)를 공유합니다.
+# Streamlit은 모든 세션을 한 프로세스의 여러 스레드에서 실행하므로, 인스턴스 하나를 st.cache_resource로
+# 공유하면 프로세스 내 모든 세션에서 동작합니다.
+
+
+def request_key(**request):
+    """요청 인자(모델, 메시지, temperature 등)로 정규화된 키 생성"""
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SharedCallError(Exception):
+    """다른 요청이 실행한 업스트림 호출의 실패를 공유받은 오류
+
+    메시지는 원래 오류와 같고 원래 오류는 error 속성에 있습니다. 속도 제한 카운터처럼
+    업스트림 호출마다 한 번만 해야 하는 처리는 이 오류가 아닐 때(직접 호출한 요청)만 하면 됩니다.
+    """
+
+    def __init__(self, error):
+        super().__init__(str(error))
+        self.error = error
+
+
+class _Call:
+    """진행 중인 호출 하나"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _StreamCall:
+    """진행 중인 스트리밍 호출 하나 (받은 청크를 모든 구독자에게 재생)"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks = []
+        self.finished = False
+        self.error = None
+
+
+class SingleFlight:
+    """동일 요청을 하나의 업스트림 호출로 병합"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._streams = {}
+        self.requests = 0
+        self.upstream_calls = 0
+
+    @property
+    def coalesced(self):
+        """업스트림 호출 없이 진행 중인 호출에 합류한 요청 수"""
+        return self.requests - self.upstream_calls
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+        }
+
+    def do(self, key, fn):
+        """fn()을 실행하고 (결과, 공유 여부) 반환
+
+        같은 키가 진행 중이면 그 결과를 기다려 공유하며, 이때 공유 여부는 True입니다
+        (업스트림 호출 비용은 직접 호출한 요청에서만 집계하도록).
+        공유받은 호출이 실패하면 원래 오류 대신 SharedCallError를 발생시킵니다.
+        """
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.upstream_calls += 1
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            if leader:
+                raise call.error
+            raise SharedCallError(call.error) from call.error
+        return call.result, not leader
+
+    def stream(self, key, fn):
+        """fn()이 반환하는 스트림을 구독 (같은 키가 진행 중이면 처음부터 재생 후 이어서 수신)"""
+        with self._lock:
+            self.requests += 1
+            call = self._streams.get(key)
+            leader = call is None
+            if leader:
+                call = self._streams[key] = _StreamCall()
+                self.upstream_calls += 1
+
+        if leader:
+            # 리더는 별도 스레드에서 업스트림을 끝까지 소비 (리더가 중간에 멈춰도 구독자는 계속 수신)
+            threading.Thread(target=self._pump, args=(key, call, fn), daemon=True).start()
+
+        index = 0
+        while True:
+            with call.cond:
+                while index >= len(call.chunks) and not call.finished:
+                    call.cond.wait()
+                pending = call.chunks[index:]
+                finished = call.finished
+            for chunk in pending:
+                yield chunk
+            index += len(pending)
+            if finished and index >= len(call.chunks):
+                break
+
+        if call.error is not None:
+            if leader:
+                raise call.error
+            raise SharedCallError(call.error) from call.error
+
+    def _pump(self, key, call, fn):
+        try:
+            for chunk in fn():
+                with call.cond:
+                    call.chunks.append(chunk)
+                    call.cond.notify_all()
+        except Exception as e:
+            call.error = e
+        finally:
+            with self._lock:
+                del self._streams[key]
+            with call.cond:
+                call.finished = True
+                call.cond.notify_all()
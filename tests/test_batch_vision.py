@@ -0,0 +1,190 @@
+import base64
+import threading
+import time
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from batch_vision import (
+    analyze_images,
+    get_max_completion_tokens,
+    preprocess_image,
+    preprocess_images,
+    split_batch_response,
+)
+
+
+def png_bytes(size=(64, 48), mode="RGBA"):
+    buffered = BytesIO()
+    Image.new(mode, size, 0).save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+class FakeCompletions:
+    """요청마다 respond(이미지 수)의 결과를 응답으로 돌려주는 가짜 client.chat.completions"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.image_counts = []
+
+    def create(self, messages, **kwargs):
+        count = len(messages[1]["content"]) - 1
+        self.image_counts.append(count)
+        content = self.respond(count)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def fake_client(respond):
+    return SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(respond)))
+
+
+@pytest.mark.parametrize("response", [
+    "[1] a cat\n[2] a dog",
+    "**[1]** a cat\n**[2]** a dog",
+    "1. a cat\n2. a dog",
+    "1) a cat\n2) a dog",
+    "**1.** a cat\n**2.** a dog",
+])
+def test_split_batch_response_formats(response):
+    assert split_batch_response(response, 2) == ["a cat", "a dog"]
+
+
+@pytest.mark.parametrize("response", [
+    "a cat and a dog",
+    "[1] a cat",
+    "[1] a cat\n[3] a dog",
+    # 답변 안의 번호 목록 때문에 순서가 어긋나는 경우
+    "1. a cat with\n1. whiskers\n2. a tail\n2. a dog",
+])
+def test_split_batch_response_unsplittable(response):
+    assert split_batch_response(response, 2) is None
+
+
+def test_split_batch_response_single_image_is_whole_answer():
+    assert split_batch_response("1. first\n2. second", 1) == ["1. first\n2. second"]
+
+
+def test_preprocess_image_resizes_and_encodes_jpeg():
+    encoded = preprocess_image(png_bytes((3000, 1000)), max_side=1024)
+    image = Image.open(BytesIO(base64.b64decode(encoded)))
+    assert image.format == "JPEG"
+    assert image.size == (1024, 341)
+
+
+def test_preprocess_images_reports_unreadable_files():
+    results = preprocess_images([("ok.png", png_bytes()), ("bad.png", b"notanimage")], max_workers=2)
+
+    (ok_name, ok_encoded, ok_error), (bad_name, bad_encoded, bad_error) = results
+    assert (ok_name, ok_error) == ("ok.png", "")
+    assert ok_encoded
+    assert bad_name == "bad.png"
+    assert bad_encoded is None
+    assert "이미지를 읽을 수 없습니다" in bad_error
+
+
+def test_analyze_images_packs_and_splits():
+    def respond(count):
+        if count == 1:
+            return "single image"
+        return "\n".join(f"[{i}] image {i}" for i in range(1, count + 1))
+
+    client = fake_client(respond)
+    images = [(f"{i}.png", "b64") for i in range(5)]
+
+    rows = list(analyze_images(client, "m", "sys", "describe", images, concurrency=2, images_per_request=2))
+
+    assert sorted(client.chat.completions.image_counts) == [1, 2, 2]
+    by_name = {row["image"]: row for row in rows}
+    assert by_name["0.png"]["result"] == "image 1"
+    assert by_name["1.png"]["result"] == "image 2"
+    assert by_name["4.png"]["result"] == "single image"
+    assert all(row["error"] == "" for row in rows)
+
+
+def test_analyze_images_retries_unsplittable_chunk_per_image():
+    # 묶음 요청에는 번호 없는 답변, 단일 요청에는 정상 답변
+    client = fake_client(lambda count: "a cat and a dog" if count > 1 else "one animal")
+    images = [("a.png", "b64"), ("b.png", "b64")]
+
+    rows = list(analyze_images(client, "m", "sys", "describe", images, images_per_request=2))
+
+    assert client.chat.completions.image_counts == [2, 1, 1]
+    assert rows == [
+        {"image": "a.png", "result": "one animal", "error": ""},
+        {"image": "b.png", "result": "one animal", "error": ""},
+    ]
+
+
+def test_analyze_images_reports_api_errors_per_image():
+    def respond(count):
+        raise RuntimeError("rate_limit_exceeded")
+
+    rows = list(analyze_images(fake_client(respond), "m", "sys", "describe", [("a.png", "b64")]))
+    assert rows == [{"image": "a.png", "result": "", "error": "rate_limit_exceeded"}]
+
+
+def test_analyze_images_close_cancels_pending_requests():
+    # 첫 요청만 바로 끝나고 나머지는 release 전까지 진행 중인 상태로 유지
+    release = threading.Event()
+    first = threading.Event()
+
+    def respond(count):
+        if first.is_set():
+            release.wait(5)
+        first.set()
+        return "answer"
+
+    client = fake_client(respond)
+    images = [(f"{i}.png", "b64") for i in range(20)]
+
+    rows = analyze_images(client, "m", "sys", "describe", images, concurrency=2)
+    next(rows)
+    start = time.monotonic()
+    rows.close()
+    elapsed = time.monotonic() - start
+    release.set()
+    time.sleep(0.2)
+
+    # 닫을 때 진행 중인 요청을 기다리지 않고, 대기 중이던 요청은 보내지 않음
+    # (첫 요청 + 닫을 때 진행 중이던 요청 최대 2개)
+    assert elapsed < 1
+    assert len(client.chat.completions.image_counts) <= 3
+
+
+def test_analyze_images_clamps_packed_max_tokens_to_model_limit():
+    client = fake_client(lambda count: "\n".join(f"[{i}] ok" for i in range(1, count + 1)))
+    max_tokens = []
+    create = client.chat.completions.create
+
+    def recording_create(messages, **kwargs):
+        max_tokens.append(kwargs["max_tokens"])
+        return create(messages, **kwargs)
+
+    client.chat.completions.create = recording_create
+    images = [(f"{i}.png", "b64") for i in range(5)]
+
+    list(analyze_images(client, "llama-3.2-90b-vision-preview", "sys", "describe", images,
+                        images_per_request=5, max_tokens=4096))
+    assert max_tokens == [get_max_completion_tokens("llama-3.2-90b-vision-preview")]
+
+
+def test_analyze_images_falls_back_per_image_when_packed_request_fails():
+    def respond(count):
+        if count > 1:
+            raise RuntimeError("request_too_large")
+        return "one animal"
+
+    client = fake_client(respond)
+    images = [(f"{i}.png", "b64") for i in range(3)]
+
+    rows = list(analyze_images(client, "m", "sys", "describe", images, images_per_request=3))
+
+    assert client.chat.completions.image_counts == [3, 1, 1, 1]
+    assert [row["result"] for row in rows] == ["one animal"] * 3
+    assert all(row["error"] == "" for row in rows)
+
+
+def test_preprocess_images_empty():
+    assert preprocess_images([]) == []
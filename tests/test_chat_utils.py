@@ -0,0 +1,32 @@
+import json
+
+from groq.types import CompletionUsage
+
+from chat_utils import build_chat_messages, build_system_prompt, extract_prompt_usage
+
+
+def test_system_prompt_prefix_is_byte_identical_across_requests():
+    first = build_chat_messages(build_system_prompt("Llama 3.3 70B"), "첫 번째 질문")
+    second = build_chat_messages(build_system_prompt("Llama 3.3 70B"), "두 번째 질문")
+    assert json.dumps(first[0], ensure_ascii=False) == json.dumps(second[0], ensure_ascii=False)
+
+
+def test_user_prompt_is_sent_as_typed():
+    prompt = "    def f():\r\n        return 1\n"
+    assert build_chat_messages("sys", prompt)[1]["content"] == prompt
+
+
+def test_extract_prompt_usage():
+    usage = CompletionUsage(
+        completion_tokens=5, prompt_tokens=100, total_tokens=105,
+        queue_time=0.02, prompt_time=0.01, prompt_tokens_details={"cached_tokens": 64}
+    )
+    prompt_tokens, cached_tokens, time_to_first_token = extract_prompt_usage(usage)
+    assert (prompt_tokens, cached_tokens) == (100, 64)
+    assert abs(time_to_first_token - 0.03) < 1e-9
+
+
+def test_extract_prompt_usage_without_details():
+    usage = CompletionUsage(completion_tokens=5, prompt_tokens=100, total_tokens=105)
+    assert extract_prompt_usage(usage) == (100, 0, 0.0)
+    assert extract_prompt_usage(None) == (0, 0, 0.0)
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from shared_state import InProcessBackend, RedisBackend, SQLiteBackend, create_backend
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return InProcessBackend()
+    if request.param == "sqlite":
+        return SQLiteBackend(str(tmp_path / "state.sqlite3"))
+    # 실제 Redis 서버 대신 Redis 프로토콜 대체 구현 사용
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisBackend(client=fakeredis.FakeRedis())
+
+
+def test_get_set_delete(backend):
+    assert backend.get("catalog", {}) == {}
+    backend.set("catalog", {"Llama 3.3 70B": "llama-3.3-70b-versatile"})
+    assert backend.get("catalog") == {"Llama 3.3 70B": "llama-3.3-70b-versatile"}
+    backend.delete("catalog")
+    assert backend.get("catalog") is None
+
+
+def test_value_ttl_expiry(backend):
+    # 1초 미만 TTL도 지원
+    backend.set("catalog", ["a"], ttl=0.2)
+    assert backend.get("catalog") == ["a"]
+    time.sleep(0.3)
+    assert backend.get("catalog") is None
+
+
+def test_incr_ttl_applies_from_first_increment(backend):
+    assert backend.incr("ratelimit:m", ttl=0.2) == 1
+    assert backend.incr("ratelimit:m", ttl=0.2) == 2
+    time.sleep(0.3)
+    # 만료 후에는 새 카운터로 시작
+    assert backend.incr("ratelimit:m", ttl=0.2) == 1
+
+
+def test_members_with_per_member_ttl(backend):
+    backend.add_member("disabled", "short", ttl=0.2)
+    backend.add_member("disabled", "long", ttl=60)
+    backend.add_member("disabled", "forever")
+    assert backend.members("disabled") == {"short", "long", "forever"}
+
+    time.sleep(0.3)
+    assert backend.members("disabled") == {"long", "forever"}
+
+    backend.remove_member("disabled", "long")
+    assert backend.members("disabled") == {"forever"}
+
+    backend.delete("disabled")
+    assert backend.members("disabled") == set()
+
+
+def test_sqlite_incr_is_atomic_across_threads(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    # 워커마다 별도 백엔드 인스턴스(= 별도 연결)로 같은 파일 공유
+    backends = [SQLiteBackend(path) for _ in range(4)]
+    barrier = threading.Barrier(8)
+
+    def worker(backend):
+        barrier.wait()
+        for _ in range(50):
+            backend.incr("counter")
+
+    threads = [threading.Thread(target=worker, args=(backends[i % 4],)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert backends[0].get("counter") == 400
+
+
+def test_sqlite_shares_state_between_instances(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    first.add_member("disabled", "Llama 3.3 70B", ttl=60)
+    assert second.members("disabled") == {"Llama 3.3 70B"}
+
+
+def test_redis_backends_share_state_through_one_server():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    first = RedisBackend(client=fakeredis.FakeRedis(server=server))
+    second = RedisBackend(client=fakeredis.FakeRedis(server=server))
+
+    first.incr("ratelimit:m", ttl=60)
+    second.incr("ratelimit:m", ttl=60)
+    first.add_member("disabled", "Llama 3.3 70B", ttl=60)
+    assert second.get("ratelimit:m") == 2
+    assert second.members("disabled") == {"Llama 3.3 70B"}
+
+
+def test_redis_incr_sets_expiry_in_same_transaction():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    backend = RedisBackend(client=client)
+
+    backend.incr("ratelimit:m", ttl=60)
+    # 카운터가 생기는 순간부터 만료 시간이 있어야 함
+    assert 0 < client.pttl("groq:ratelimit:m") <= 60000
+    client.pexpire("groq:ratelimit:m", 5000)
+    backend.incr("ratelimit:m", ttl=60)
+    # 이후 증가는 만료 시간을 연장하지 않음
+    assert client.pttl("groq:ratelimit:m") <= 5000
+
+
+def test_create_backend(tmp_path):
+    assert isinstance(create_backend("memory"), InProcessBackend)
+    assert isinstance(create_backend("sqlite", path=str(tmp_path / "s.sqlite3")), SQLiteBackend)
+    with pytest.raises(ValueError):
+        create_backend("memcached")
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+
+from single_flight import SharedCallError, SingleFlight
+
+
+def wait_for(condition, timeout=5.0):
+    """condition()이 참이 될 때까지 대기 (시간 초과 시 실패)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.001)
+
+
+def run_in_threads(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def join_all(threads):
+    for thread in threads:
+        thread.join(timeout=5.0)
+        assert not thread.is_alive()
+
+
+def test_do_coalesces_concurrent_requests():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def upstream():
+        calls.append(1)
+        # 모든 요청이 합류할 때까지 업스트림 호출을 끝내지 않음
+        release.wait(timeout=5.0)
+        return "response"
+
+    results = []
+    threads = run_in_threads(8, lambda: results.append(single_flight.do("key", upstream)))
+    wait_for(lambda: single_flight.requests == 8)
+    release.set()
+    join_all(threads)
+
+    # 업스트림을 직접 호출한 요청 하나만 공유 여부가 False
+    assert sorted(results) == [("response", False)] + [("response", True)] * 7
+    assert len(calls) == 1
+    assert single_flight.stats() == {"requests": 8, "upstream_calls": 1, "coalesced": 7}
+
+
+def test_do_propagates_error_to_followers_and_releases_key():
+    single_flight = SingleFlight()
+    release = threading.Event()
+
+    def failing_upstream():
+        release.wait(timeout=5.0)
+        raise RuntimeError("rate_limit_exceeded")
+
+    errors = []
+
+    def call():
+        try:
+            single_flight.do("key", failing_upstream)
+        except Exception as e:
+            errors.append(e)
+
+    threads = run_in_threads(4, call)
+    wait_for(lambda: single_flight.requests == 4)
+    release.set()
+    join_all(threads)
+
+    assert [str(e) for e in errors] == ["rate_limit_exceeded"] * 4
+    assert single_flight.upstream_calls == 1
+
+    # 직접 호출한 요청만 원래 오류를 받고, 합류한 요청은 공유받은 오류임을 알 수 있음
+    leaders = [e for e in errors if not isinstance(e, SharedCallError)]
+    followers = [e for e in errors if isinstance(e, SharedCallError)]
+    assert len(leaders) == 1 and isinstance(leaders[0], RuntimeError)
+    assert len(followers) == 3
+    assert all(e.error is leaders[0] for e in followers)
+
+    # 실패 후에는 키가 해제되어 다음 요청이 새로 업스트림을 호출
+    assert single_flight.do("key", lambda: "retried") == ("retried", False)
+    assert single_flight.upstream_calls == 2
+
+
+def test_different_keys_are_not_coalesced():
+    single_flight = SingleFlight()
+    assert single_flight.do("a", lambda: 1) == (1, False)
+    assert single_flight.do("b", lambda: 2) == (2, False)
+    assert single_flight.coalesced == 0
+
+
+def test_stream_replays_chunks_to_late_subscribers():
+    single_flight = SingleFlight()
+    release = threading.Event()
+
+    def upstream():
+        yield 0
+        release.wait(timeout=5.0)
+        yield from [1, 2, 3, 4]
+
+    first = single_flight.stream("key", upstream)
+    assert next(first) == 0
+
+    # 진행 중인 스트림에 늦게 합류해도 처음부터 모든 청크 수신
+    late = single_flight.stream("key", upstream)
+    assert next(late) == 0
+    release.set()
+    assert list(late) == [1, 2, 3, 4]
+    assert list(first) == [1, 2, 3, 4]
+    assert single_flight.upstream_calls == 1
+
+
+def test_stream_error_is_shared_with_late_subscribers():
+    single_flight = SingleFlight()
+    release = threading.Event()
+
+    def failing_upstream():
+        yield "partial"
+        release.wait(timeout=5.0)
+        raise RuntimeError("connection reset")
+
+    first = single_flight.stream("key", failing_upstream)
+    late = single_flight.stream("key", failing_upstream)
+    assert next(first) == "partial"
+    assert next(late) == "partial"
+    release.set()
+
+    with pytest.raises(RuntimeError, match="connection reset") as leader_error:
+        list(first)
+    with pytest.raises(SharedCallError, match="connection reset") as shared_error:
+        list(late)
+    assert shared_error.value.error is leader_error.value
+
+
+def test_stream_propagates_error_and_releases_key():
+    single_flight = SingleFlight()
+
+    def failing_upstream():
+        yield "partial"
+        raise RuntimeError("connection reset")
+
+    chunks = []
+    with pytest.raises(RuntimeError, match="connection reset"):
+        for chunk in single_flight.stream("key", failing_upstream):
+            chunks.append(chunk)
+    assert chunks == ["partial"]
+
+    assert list(single_flight.stream("key", lambda: iter(["ok"]))) == ["ok"]
+    assert single_flight.upstream_calls == 2